@@ -1,6 +1,11 @@
+import orjson
 import pandas as pd
 import re
-import ast
+
+try:
+    import re2  # type: ignore[import]
+except ImportError:  # pragma: no cover - optional dependency
+    re2 = None
 
 
 # 1. THE DICTIONARY (The "Brain")
@@ -11,25 +16,27 @@ SKILL_KEYWORDS = {
     "Python": r"\bpython\b",
     "SQL": r"\bsql\b",
     "Java": r"\bjava\b",  # Will not match "Javascript" due to \b
-    "JavaScript": r"\b(javascript|js)\b",
+    "JavaScript": r"\b(?:javascript|js)\b",
     "TypeScript": r"\btypescript\b",
     "C++": r"\bc\+\+\b",
-    "C#": r"\bc#|csharp\b",
+    "C#": r"\bc#|\bcsharp\b",  # No trailing \b after "#": it would need a word character next
     "R": r"\bR\b",  # Capital R only, with boundaries
     "PHP": r"\bphp\b",
     "Go": r"\bgolang\b|\bGo\b",
     "VBA": r"\bvba\b",
     # Frameworks & Libraries (Data & Web)
-    "React": r"\breact(?:\.js)?\b",
+    # React/Vue take no "(?:\.js)?" suffix: it never changes whether they match,
+    # and leaving ".js" unconsumed lets the fused scan still report JavaScript.
+    "React": r"\breact\b",
     "Angular": r"\bangular\b",
-    "Vue.js": r"\bvue(?:\.js)?\b",
+    "Vue.js": r"\bvue\b",
     "Spring Boot": r"\bspring\s?boot\b",
     "Django": r"\bdjango\b",
     "Flask": r"\bflask\b",
     "FastAPI": r"\bfastapi\b",
     "Pandas": r"\bpandas\b",
     "NumPy": r"\bnumpy\b",
-    "Scikit-Learn": r"\bscikit-learn|sklearn\b",
+    "Scikit-Learn": r"\b(?:scikit-learn|sklearn)\b",
     "TensorFlow": r"\btensorflow\b",
     "PyTorch": r"\bpytorch\b",
     "Spark": r"\bspark\b",
@@ -37,10 +44,10 @@ SKILL_KEYWORDS = {
     "Airflow": r"\bairflow\b",
     # Tools & Platforms
     "Docker": r"\bdocker\b",
-    "Kubernetes": r"\bkubernetes|k8s\b",
-    "AWS": r"\baws|amazon web services\b",
+    "Kubernetes": r"\b(?:kubernetes|k8s)\b",
+    "AWS": r"\b(?:aws|amazon web services)\b",
     "Azure": r"\bazure\b",
-    "GCP": r"\bgcp|google cloud\b",
+    "GCP": r"\b(?:gcp|google cloud)\b",
     "Git": r"\bgit\b",
     "Jenkins": r"\bjenkins\b",
     "Terraform": r"\bterraform\b",
@@ -51,12 +58,12 @@ SKILL_KEYWORDS = {
     "Tableau": r"\btableau\b",
     "Excel": r"\bexcel\b",
     # Concepts (Good for Analytics)
-    "Machine Learning": r"\bmachine learning|ml\b",
-    "Deep Learning": r"\bdeep learning|dl\b",
-    "NLP": r"\bnlp|natural language processing\b",
+    "Machine Learning": r"\b(?:machine learning|ml)\b",
+    "Deep Learning": r"\b(?:deep learning|dl)\b",
+    "NLP": r"\b(?:nlp|natural language processing)\b",
     "Big Data": r"\bbig data\b",
     "DevOps": r"\bdevops\b",
-    "Agile": r"\bagile|scrum\b",
+    "Agile": r"\b(?:agiles?|scrum)\b",  # "agiles": French plural (méthodes agiles)
 }
 
 
@@ -73,71 +80,167 @@ def clean_text(text):
     return text.lower()
 
 
+# Same mapping as clean_text: newlines become spaces, carriage returns are dropped
+NEWLINE_TABLE = str.maketrans({"\n": " ", "\r": None})
+
+
+def clean_descriptions(descriptions):
+    """
+    Vectorized clean_text for a whole Series of descriptions.
+    Missing values become "" so every row can be matched.
+    """
+    return descriptions.fillna("").str.translate(NEWLINE_TABLE).str.lower()
+
+
+# Each skill pattern compiled once up front instead of on every re.search call.
+# No IGNORECASE flag: descriptions are lowercased by clean_text, and ignoring
+# case would turn the case-sensitive R and Go patterns into matches on every
+# "r"/"go" word.
+SKILL_PATTERNS = {skill_name: re.compile(pattern) for skill_name, pattern in SKILL_KEYWORDS.items()}
+
+# With google-re2 installed, all skill patterns are fused into one alternation
+# compiled to a single linear-time automaton, so each description is scanned
+# once instead of once per skill. Group names must be identifiers ("C++" is
+# not), so each skill gets a positional group name mapped back via
+# SKILL_GROUP_NAMES. The stdlib engine runs the fused pattern slower than the
+# per-skill loop, so without RE2 SKILLS_RE is None and SKILL_PATTERNS is used.
+SKILL_GROUP_NAMES = {f"skill_{index}": skill_name for index, skill_name in enumerate(SKILL_KEYWORDS)}
+SKILLS_PATTERN = "|".join(
+    f"(?P<{group}>{SKILL_KEYWORDS[skill_name]})" for group, skill_name in SKILL_GROUP_NAMES.items()
+)
+SKILLS_RE = re2.compile(SKILLS_PATTERN) if re2 is not None else None
+# RE2's \b only treats ASCII characters as word characters. Accented letters
+# (common in French postings) are masked with "_" before matching so that
+# e.g. "prévue" does not yield "Vue.js"; no skill pattern contains "_".
+NON_ASCII_WORD_RE = re.compile(r"[^\W\x00-\x7f]")
+
+
+def match_skills(clean_desc):
+    """
+    Scans an already cleaned description for skills, with the fused SKILLS_RE
+    pattern when RE2 is installed and the per-skill SKILL_PATTERNS otherwise.
+    Returns a list of unique skills found, in SKILL_KEYWORDS order.
+    """
+    if SKILLS_RE is None:
+        return [skill_name for skill_name, pattern in SKILL_PATTERNS.items() if pattern.search(clean_desc)]
+    found = {SKILL_GROUP_NAMES[match.lastgroup] for match in SKILLS_RE.finditer(clean_desc)}
+    return [skill_name for skill_name in SKILL_KEYWORDS if skill_name in found]
+
+
 def extract_skills(description):
     """
-    Scans the description against the SKILL_KEYWORDS dictionary.
-    Returns a list of unique skills found.
+    Scans the description for skills (see match_skills).
+    Returns a list of unique skills found, in SKILL_KEYWORDS order.
     """
-    found_skills = []
     clean_desc = clean_text(description)
+    if re2 is not None:
+        clean_desc = NON_ASCII_WORD_RE.sub("_", clean_desc)
+    return match_skills(clean_desc)
+
+
+def extract_skills_series(descriptions):
+    """
+    Vectorized extract_skills for a whole Series of descriptions.
+    Cleaning runs column-wise; each description is then matched by
+    match_skills (after masking non-ASCII letters when RE2 is installed).
+    """
+    clean_descs = clean_descriptions(descriptions)
+    if re2 is not None:
+        clean_descs = (NON_ASCII_WORD_RE.sub("_", clean_desc) for clean_desc in clean_descs)
+    return pd.Series(
+        [match_skills(clean_desc) for clean_desc in clean_descs],
+        index=descriptions.index,
+        dtype=object,
+    )
+
 
-    for skill_name, pattern in SKILL_KEYWORDS.items():
-        # Search using Regex (Ignore Case)
-        if re.search(pattern, clean_desc):
-            found_skills.append(skill_name)
+def _json_default(value):
+    """Serializes the missing-value markers left by arrow-backed columns as null."""
+    if value is pd.NA or value is pd.NaT:
+        return None
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
 
-    return found_skills
+
+def write_json_records(df, output_file):
+    """
+    Writes the DataFrame as a JSON array of records, one record at a time,
+    so the full JSON document is never held in memory.
+    """
+    columns = df.columns.tolist()
+    option = orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY
+    with open(output_file, "wb") as file:
+        file.write(b"[")
+        for index, row in enumerate(df.itertuples(index=False, name=None)):
+            file.write(b",\n" if index else b"\n")
+            file.write(orjson.dumps(dict(zip(columns, row)), option=option, default=_json_default))
+        file.write(b"\n]\n")
 
 
 # 2. EXECUTION LOGIC
 
-print("📂 Loading data...")
-# Load the CSV you generated in Phase 1
-df = pd.read_csv("morocco_data_market.csv")
-
-print(f"📊 Analyzing {len(df)} job descriptions...")
-
-# Apply the extraction function to the 'description' column
-# We use a lambda function to apply it row by row
-df["extracted_skills"] = df["description"].apply(extract_skills)
-
-# Count how many skills we found on average
-avg_skills = df["extracted_skills"].apply(len).mean()
-print(f"✅ Extraction complete. Average skills per job: {avg_skills:.1f}")
-
-# 3. SAVE THE CLEAN DATA
-
-# We only keep the columns we need for the App
-final_df = df[
-    [
-        "title",
-        "company",
-        "location",
-        "date_posted",
-        "job_url",
-        "searched_city",
-        "searched_role",
-        "extracted_skills",
-    ]
+# Scraped columns carried through to processed_jobs_for_api.json
+API_COLUMNS = [
+    "title",
+    "company",
+    "location",
+    "date_posted",
+    "job_url",
+    "searched_city",
+    "searched_role",
 ]
 
-output_file = "processed_jobs_for_api.json"
 
-# Save as JSON (Better for Web Apps/API than CSV because it handles Lists [] better)
-final_df.to_json(output_file, orient="records", indent=2)
+def main():
+    """Extract skills from the scraped CSV and save the API-ready JSON."""
+    print("📂 Loading data...")
+    # Load the CSV you generated in Phase 1
+    # Arrow-backed string columns keep the large description text out of
+    # per-row Python objects. The pyarrow *engine* can't parse the scraper's
+    # escaped multi-line descriptions, so only the dtype backend is switched.
+    # Only the columns the API needs (plus the description) are loaded at all.
+    df = pd.read_csv(
+        "morocco_data_market.csv",
+        usecols=[*API_COLUMNS, "description"],
+        dtype_backend="pyarrow",
+    )
+
+    print(f"📊 Analyzing {len(df)} job descriptions...")
+
+    # Extract skills for the whole 'description' column in one vectorized pass
+    df["extracted_skills"] = extract_skills_series(df["description"])
+
+    # Count how many skills we found on average
+    avg_skills = df["extracted_skills"].str.len().mean()
+    print(f"✅ Extraction complete. Average skills per job: {avg_skills:.1f}")
+
+    # 3. SAVE THE CLEAN DATA
+
+    # We only keep the columns we need for the App
+    final_df = df[[*API_COLUMNS, "extracted_skills"]]
 
-print(f"💾 Saved processed data to {output_file}")
+    output_file = "processed_jobs_for_api.json"
 
-# 4. BONUS: PRINT TOP INSIGHTS (To verify it works)
+    # Save as JSON (Better for Web Apps/API than CSV because it handles Lists [] better)
+    write_json_records(final_df, output_file)
 
+    print(f"💾 Saved processed data to {output_file}")
 
+    # 4. BONUS: PRINT TOP INSIGHTS (To verify it works)
 
-print("\n🚀 TOP 10 SKILLS IN MOROCCO (Based on your data):")
-all_skills = [skill for sublist in df["extracted_skills"] for skill in sublist]
-from collections import Counter
+    print("\n🚀 TOP 10 SKILLS IN MOROCCO (Based on your data):")
+    # Ties keep first-seen order, matching Counter.most_common
+    top_skills = (
+        df["extracted_skills"]
+        .explode()
+        .dropna()
+        .value_counts(sort=False)
+        .sort_values(ascending=False, kind="stable")
+        .head(10)
+    )
 
-top_skills = Counter(all_skills).most_common(10)
+    for skill, count in top_skills.items():
+        print(f"{skill}: {count} jobs")
 
-for skill, count in top_skills:
-    print(f"{skill}: {count} jobs")
 
+if __name__ == "__main__":
+    main()
@@ -4,11 +4,12 @@ Trend Forecasting and Analytics Module
 Analyzes historical job data to predict future trends and generate insights.
 """
 
-import json
 from collections import defaultdict
 from datetime import datetime, timedelta
-from typing import Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 import numpy as np
+import orjson
+import pandas as pd
 from pathlib import Path
 
 DATA_FILE = Path("processed_jobs_for_api.json")
@@ -21,8 +22,36 @@ def load_jobs_data() -> List[Dict]:
         print(f"❌ Data file {DATA_FILE} not found.")
         return []
     
-    with DATA_FILE.open("r", encoding="utf-8") as f:
-        return json.load(f)
+    return orjson.loads(DATA_FILE.read_bytes())
+
+
+def month_key(date_str: Any) -> Optional[str]:
+    """Return the YYYY-MM bucket of an ISO date string, or None when it can't be parsed."""
+    if not date_str:
+        return None
+    try:
+        return datetime.fromisoformat(date_str).strftime("%Y-%m")
+    except (TypeError, ValueError):  # e.g. NaN left in the JSON by pandas
+        return None
+
+
+def month_keys(dates: pd.Series) -> pd.Series:
+    """Vectorized month_key(): bucket a column of dates into YYYY-MM keys (None when unparseable).
+
+    Shared with main.py, so the API and this report bucket dates the same way.
+    """
+    # Dates repeat heavily, so only the distinct values are parsed
+    unique_dates = pd.Series(dates.unique(), dtype=object)
+    # Plain YYYY-MM-DD dates (Postgres DATE values) go through datetime64 in one vectorized step
+    canonical = unique_dates.str.fullmatch(r"\d{4}-\d{2}-\d{2}").fillna(False).astype(bool)
+    parsed = pd.to_datetime(unique_dates[canonical], format="%Y-%m-%d", errors="coerce")
+    keys = pd.Series(None, index=unique_dates.index, dtype=object)
+    keys[canonical] = np.where(
+        parsed.isna(), None, np.datetime_as_string(parsed.to_numpy().astype("datetime64[M]"), unit="M")
+    )
+    # Timestamps, mixed offsets and dates like "2025-03-01+00:00" keep fromisoformat's semantics
+    keys[~canonical] = unique_dates[~canonical].map(month_key)
+    return dates.map(dict(zip(unique_dates, keys)))
 
 
 def calculate_monthly_skill_counts(jobs: List[Dict]) -> Dict[str, Dict[str, int]]:
@@ -30,25 +59,20 @@ def calculate_monthly_skill_counts(jobs: List[Dict]) -> Dict[str, Dict[str, int]
     Calculate skill counts per month.
     Returns: {skill: {month: count}}
     """
-    monthly_counts = defaultdict(lambda: defaultdict(int))
-    
-    for job in jobs:
-        date_str = job.get("date_posted")
-        skills = job.get("extracted_skills", [])
-        
-        if not date_str or not skills:
-            continue
-        
-        try:
-            date_obj = datetime.fromisoformat(date_str)
-            month_key = date_obj.strftime("%Y-%m")
-            
-            for skill in skills:
-                monthly_counts[skill][month_key] += 1
-        except (ValueError, TypeError):
-            continue
-    
-    return dict(monthly_counts)
+    if not jobs:
+        return {}
+
+    df = pd.DataFrame(jobs, columns=["date_posted", "extracted_skills"])
+    # Unparseable or missing dates get no month and are dropped with jobs lacking skills
+    df["month"] = month_keys(df["date_posted"])
+    exploded = df.explode("extracted_skills").dropna(subset=["month", "extracted_skills"])
+
+    # sort=False keeps skills in first-seen order, like the dict it replaces
+    counts = exploded.groupby(["extracted_skills", "month"], sort=False).size()
+    return {
+        skill: months.droplevel(0).to_dict()
+        for skill, months in counts.groupby(level=0, sort=False)
+    }
 
 
 def simple_linear_regression(x: List[float], y: List[float]) -> Tuple[float, float]:
@@ -56,34 +80,72 @@ def simple_linear_regression(x: List[float], y: List[float]) -> Tuple[float, flo
     Calculate linear regression: y = mx + b
     Returns: (slope, intercept)
     """
-    n = len(x)
-    if n < 2:
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    if x.size < 2:
         return 0, 0
     
-    x_mean = np.mean(x)
-    y_mean = np.mean(y)
-    
-    numerator = sum((x[i] - x_mean) * (y[i] - y_mean) for i in range(n))
-    denominator = sum((x[i] - x_mean) ** 2 for i in range(n))
+    x_mean = x.mean()
+    y_mean = y.mean()
+    dx = x - x_mean
     
+    denominator = dx @ dx
     if denominator == 0:
         return 0, y_mean
     
-    slope = numerator / denominator
+    slope = (dx @ (y - y_mean)) / denominator
     intercept = y_mean - slope * x_mean
     
     return slope, intercept
 
 
+def batch_linear_regression(series: List[List[float]]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Calculate simple_linear_regression for many series in one pass.
+    Each series is regressed on its own positions (0, 1, 2, ...); shorter
+    series are right-padded and masked out of every sum.
+    Returns: (slopes, intercepts) arrays in input order
+    """
+    if not series:
+        return np.zeros(0), np.zeros(0)
+    
+    lengths = np.array([len(values) for values in series])
+    mask = np.arange(lengths.max()) < lengths[:, None]
+    y = np.zeros(mask.shape)
+    y[mask] = np.concatenate([np.asarray(values, dtype=float) for values in series])
+    x = np.arange(mask.shape[1], dtype=float)
+    
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x_mean = (x * mask).sum(axis=1) / lengths
+        y_mean = y.sum(axis=1) / lengths
+        dx = (x - x_mean[:, None]) * mask
+        denominator = (dx * dx).sum(axis=1)
+        slopes = (dx * (y - y_mean[:, None])).sum(axis=1) / denominator
+    
+    # Same fallbacks as simple_linear_regression: (0, 0) below two points, (0, mean) for zero variance
+    flat = ~(denominator > 0)
+    intercepts = np.where(flat, y_mean, y_mean - slopes * x_mean)
+    slopes = np.where(flat, 0.0, slopes)
+    intercepts = np.where(lengths < 2, 0.0, intercepts)
+    
+    return slopes, intercepts
+
+
 def calculate_moving_average(values: List[float], window: int = 3) -> float:
     """Calculate simple moving average."""
-    if len(values) < window:
-        return np.mean(values) if values else 0
+    if len(values) == 0:
+        return 0
     
+    window = min(window, len(values))
     return np.mean(values[-window:])
 
 
-def forecast_skill_trend(skill: str, monthly_data: Dict[str, int], months_ahead: int = 1) -> Dict:
+def forecast_skill_trend(
+    skill: str,
+    monthly_data: Dict[str, int],
+    months_ahead: int = 1,
+    regression: Optional[Tuple[float, float]] = None,
+) -> Dict:
     """
     Forecast skill demand using linear regression and moving average.
     
@@ -91,6 +153,7 @@ def forecast_skill_trend(skill: str, monthly_data: Dict[str, int], months_ahead:
         skill: Skill name
         monthly_data: {month: count} dictionary
         months_ahead: Number of months to forecast ahead
+        regression: Precomputed (slope, intercept), e.g. from batch_linear_regression
     
     Returns:
         Dictionary with forecast results
@@ -107,11 +170,11 @@ def forecast_skill_trend(skill: str, monthly_data: Dict[str, int], months_ahead:
     counts = [monthly_data[month] for month in sorted_months]
     
     # Create numeric x values (0, 1, 2, ...)
-    x = list(range(len(sorted_months)))
-    y = counts
+    x = np.arange(len(sorted_months))
+    y = np.asarray(counts)
     
     # Linear regression
-    slope, intercept = simple_linear_regression(x, y)
+    slope, intercept = regression if regression is not None else simple_linear_regression(x, y)
     
     # Predict next month(s)
     next_x = len(x)
@@ -188,56 +251,47 @@ def generate_city_tech_heatmap(jobs: List[Dict]) -> Dict:
     Returns:
         Dictionary with cities, skills, and matrix data
     """
-    city_skill_counts = defaultdict(lambda: defaultdict(int))
-    
-    # Count skills per city
-    for job in jobs:
-        city = job.get("searched_city", "Unknown")
-        skills = job.get("extracted_skills", [])
-        
-        if city and skills:
-            for skill in skills:
-                city_skill_counts[city][skill] += 1
-    
+    # One row per (city, skill) mention; jobs without a city or skills are skipped
+    mentions = pd.DataFrame({
+        "city": [job.get("searched_city", "Unknown") for job in jobs],
+        "skill": [job.get("extracted_skills", []) for job in jobs],
+    })
+    mentions = mentions[mentions["city"].fillna("") != ""].explode("skill").dropna(subset=["skill"])
+
+    # Pair counts in first-seen order; ties below are broken by that order,
+    # exactly like the nested dicts this replaces
+    pair_counts = mentions.groupby(["city", "skill"], sort=False).size()
+    matrix_counts = pair_counts.unstack(fill_value=0) if len(pair_counts) else pd.DataFrame()
+    city_totals = pair_counts.groupby(level="city").sum()
+
     # Get top cities and skills
-    all_cities = sorted(city_skill_counts.keys())
-    
-    # Get top 15 most common skills across all cities
-    skill_totals = defaultdict(int)
-    for city_data in city_skill_counts.values():
-        for skill, count in city_data.items():
-            skill_totals[skill] += count
-    
-    top_skills = sorted(skill_totals.items(), key=lambda x: x[1], reverse=True)[:15]
-    top_skill_names = [skill for skill, _ in top_skills]
-    
+    all_cities = sorted(city_totals.index)
+
+    # Get top 15 most common skills across all cities (city-major first-seen order for ties)
+    city_rank = pd.Series(range(city_totals.size), index=pair_counts.index.unique(level="city"))
+    city_major = pair_counts.iloc[np.argsort(city_rank[pair_counts.index.get_level_values("city")].to_numpy(), kind="stable")]
+    skill_totals = city_major.groupby(level="skill", sort=False).sum()
+    top_skill_names = skill_totals.sort_values(ascending=False, kind="stable").head(15).index.tolist()
+
     # Build matrix
-    matrix = []
-    for city in all_cities:
-        row = {
+    matrix = [
+        {
             "city": city,
-            "total_jobs": sum(city_skill_counts[city].values()),
-            "skills": {},
+            "total_jobs": int(city_totals[city]),
+            "skills": {skill: int(count) for skill, count in matrix_counts.loc[city, top_skill_names].items()},
         }
-        
-        for skill in top_skill_names:
-            count = city_skill_counts[city].get(skill, 0)
-            row["skills"][skill] = count
-        
-        matrix.append(row)
-    
-    # Calculate percentages and dominance
+        for city in all_cities
+    ]
+
+    # Calculate percentages and dominance (first-seen skill wins ties within a city)
+    dominant = pair_counts.groupby(level="city", sort=False).idxmax()
     insights = []
     for city in all_cities:
-        city_data = city_skill_counts[city]
-        if not city_data:
-            continue
-        
-        total = sum(city_data.values())
-        top_skill_in_city = max(city_data.items(), key=lambda x: x[1])
-        skill_name, skill_count = top_skill_in_city
+        skill_name = dominant[city][1]
+        skill_count = int(pair_counts[(city, skill_name)])
+        total = int(city_totals[city])
         percentage = (skill_count / total) * 100
-        
+
         insights.append({
             "city": city,
             "dominant_skill": skill_name,
@@ -245,7 +299,7 @@ def generate_city_tech_heatmap(jobs: List[Dict]) -> Dict:
             "percentage": round(percentage, 1),
             "total_jobs": total,
         })
-    
+
     return {
         "cities": all_cities,
         "skills": top_skill_names,
@@ -262,8 +316,9 @@ def generate_city_tech_heatmap(jobs: List[Dict]) -> Dict:
 def save_snapshot(data: Dict, filename: str = "analytics_snapshot.json"):
     """Save analytics snapshot to file."""
     output_path = Path(filename)
-    with output_path.open("w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    output_path.write_bytes(
+        orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    )
     print(f"💾 Saved analytics snapshot to {filename}")
 
 
@@ -296,9 +351,14 @@ def main():
     print("\n🔮 TREND FORECASTING (Top 10 Skills)")
     print("-" * 70)
     
+    # Fit every top skill's trend line in one batched regression
+    slopes, intercepts = batch_linear_regression(
+        [[monthly_data[skill][month] for month in sorted(monthly_data[skill])] for skill, _ in top_skills]
+    )
+    
     forecasts = []
-    for skill, total_count in top_skills:
-        forecast = forecast_skill_trend(skill, monthly_data[skill])
+    for (skill, total_count), slope, intercept in zip(top_skills, slopes, intercepts):
+        forecast = forecast_skill_trend(skill, monthly_data[skill], regression=(slope, intercept))
         if forecast["status"] == "success":
             forecasts.append(forecast)
             
@@ -7,13 +7,19 @@ Usage:
     python3 generate_embeddings.py
 
 Requirements:
-    pip install sentence-transformers supabase
+    pip install "sentence-transformers[onnx]>=3.2" supabase  # [onnx]: int8 ONNX encoding on CPU
 """
-import json
+import hashlib
+import importlib.util
+import io
 import os
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import Any
 
+import numpy as np
+import torch
 from dotenv import load_dotenv
 from sentence_transformers import SentenceTransformer
 from supabase import create_client
@@ -26,7 +32,14 @@ except Exception as e:
 # Use a lightweight, fast model that works well for job descriptions
 # all-MiniLM-L6-v2: 384 dimensions, fast, good quality
 MODEL_NAME = "all-MiniLM-L6-v2"
-BATCH_SIZE = 32  # Process jobs in batches for efficiency
+BATCH_SIZE = 256  # Encoder batch size; large batches keep the model (the bottleneck) busy
+UPLOAD_CHUNK_SIZE = 10  # Rows per upsert request, to avoid payload size limits
+UPLOAD_WORKERS = 8  # Upsert requests in flight at once (I/O-bound, so threads overlap the round-trips)
+EMBEDDING_CACHE_FILE = Path("embedding_cache.sqlite")  # Content-hash -> vector, reused across runs
+# Quantized ONNX export shipped with the model on the Hub; used on CPU when the
+# sentence-transformers[onnx] extra (optimum + onnxruntime) is installed
+ONNX_MODEL_FILE = os.environ.get("EMBEDDING_ONNX_FILE", "onnx/model_quint8_avx2.onnx")
+ONNX_BACKEND_AVAILABLE = all(importlib.util.find_spec(module) for module in ("onnxruntime", "optimum"))
 
 SUPABASE_URL = os.environ.get("SUPABASE_URL", "https://cajemqbnvxmtqfsnnvjt.supabase.co")
 SUPABASE_KEY = os.environ.get(
@@ -57,12 +70,66 @@ def build_searchable_text(job: dict[str, Any]) -> str:
     return " ".join(parts)
 
 
+def load_model(device: str) -> tuple[SentenceTransformer, str]:
+    """Load the encoder, preferring the int8 ONNX Runtime backend on CPU when its extra is installed."""
+    if device == "cpu" and ONNX_BACKEND_AVAILABLE:
+        try:
+            model = SentenceTransformer(
+                MODEL_NAME,
+                device=device,
+                backend="onnx",
+                model_kwargs={"file_name": ONNX_MODEL_FILE},
+            )
+            return model, "onnx-int8"
+        except Exception as exc:
+            print(f"⚠️ ONNX backend failed to load ({exc}). Falling back to PyTorch.")
+
+    model = SentenceTransformer(MODEL_NAME, device=device)
+    if device == "cuda":
+        model.half()  # FP16 on GPU; vectors are cast back to float32 before upload
+        return model, "torch-fp16"
+    return model, "torch-fp32"
+
+
+def embedding_cache_key(text: str, backend: str) -> str:
+    """Hash the exact encoder input, model and backend/precision, so a key only matches an identical embedding."""
+    return hashlib.sha256(f"{MODEL_NAME}|{backend}|{text}".encode("utf-8")).hexdigest()
+
+
+def load_cached_embeddings(conn: sqlite3.Connection, keys: list[str]) -> dict[str, np.ndarray]:
+    """Fetch the cached vectors for the given keys (absent keys are simply missing)."""
+    cached: dict[str, np.ndarray] = {}
+    for start in range(0, len(keys), 500):  # Stay under SQLite's bound-parameter limit
+        chunk = keys[start : start + 500]
+        placeholders = ",".join("?" * len(chunk))
+        rows = conn.execute(
+            f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", chunk
+        )
+        cached.update((key, np.frombuffer(vector, dtype=np.float32)) for key, vector in rows)
+    return cached
+
+
+def to_vector_literals(embeddings: np.ndarray) -> list[str]:
+    """Format each row as a pgvector literal ("[x,y,...]") for the vector(384) column."""
+    buffer = io.StringIO()
+    # %.9g round-trips float32 exactly
+    np.savetxt(buffer, embeddings, fmt="%.9g", delimiter=",")
+    return [f"[{line}]" for line in buffer.getvalue().splitlines()]
+
+
+def upload_embeddings(client, updates: list[dict[str, Any]]) -> int:
+    """Upsert one chunk of embeddings and return how many rows were saved."""
+    client.table("jobs").upsert(updates).execute()
+    return len(updates)
+
+
 def main():
     """Generate embeddings for all jobs and store in Supabase."""
     print("🤖 Loading sentence transformer model...")
     try:
-        model = SentenceTransformer(MODEL_NAME)
-        print(f"✅ Model loaded: {MODEL_NAME} (384 dimensions)")
+        device = "cuda" if torch.cuda.is_available() else "cpu"
+        model, backend = load_model(device)
+        print(f"✅ Model loaded: {MODEL_NAME} (384 dimensions) on {device} [{backend}]")
     except Exception as exc:
         print(f"❌ Failed to load model: {exc}")
         print("   Install with: pip install sentence-transformers")
@@ -75,77 +142,81 @@ def main():
         print(f"❌ Failed to connect to Supabase: {exc}")
         return
 
-    print("📊 Fetching jobs from Supabase...")
+    # Let the database filter out jobs that already have embeddings
+    print("📊 Fetching jobs that need embeddings from Supabase...")
     try:
-        response = client.table("jobs").select("id,title,company,searched_role,extracted_skills").execute()
-        jobs = response.data or []
-        print(f"   Found {len(jobs)} jobs")
+        response = (
+            client.table("jobs")
+            .select("id,title,company,searched_role,extracted_skills")
+            .is_("embedding", "null")
+            .execute()
+        )
+        jobs_to_process = response.data or []
+        print(f"   {len(jobs_to_process)} jobs need embeddings")
     except Exception as exc:
         print(f"❌ Failed to fetch jobs: {exc}")
         return
 
-    if not jobs:
-        print("⚠️ No jobs found in Supabase. Run import_to_supabase.py first.")
-        return
-
-    # Filter jobs that don't have embeddings yet
-    print("\n🔍 Checking which jobs need embeddings...")
-    jobs_with_embeddings = set()
-    try:
-        response = client.table("jobs").select("id").not_.is_("embedding", "null").execute()
-        jobs_with_embeddings = {job["id"] for job in (response.data or [])}
-        print(f"   {len(jobs_with_embeddings)} jobs already have embeddings")
-    except Exception as exc:
-        print(f"   ⚠️ Could not check existing embeddings: {exc}")
-        print("   Will generate embeddings for all jobs")
-
-    jobs_to_process = [job for job in jobs if job.get("id") not in jobs_with_embeddings]
-    print(f"   {len(jobs_to_process)} jobs need embeddings")
-
     if not jobs_to_process:
         print("\n✅ All jobs already have embeddings!")
+        print("   (If the table is empty, run import_to_supabase.py first.)")
         return
 
-    print(f"\n🧮 Generating embeddings in batches of {BATCH_SIZE}...")
+    # Build every input text up front so encoding is one contiguous pass
+    texts = [build_searchable_text(job) for job in jobs_to_process]
+
+    # Jobs re-scraped with unchanged content reuse the vector from an earlier run with the same
+    # backend (keys include it, so int8/fp16/fp32 vectors are never mixed up)
+    keys = [embedding_cache_key(text, backend) for text in texts]
+    with sqlite3.connect(EMBEDDING_CACHE_FILE) as cache:
+        cache.execute("CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)")
+        cached = load_cached_embeddings(cache, keys)
+        hits = sum(key in cached for key in keys)
+        print(f"\n♻️ Reusing cached embeddings for {hits} jobs")
+        # Identical texts within this run are encoded once too
+        missing = {key: text for key, text in zip(keys, texts) if key not in cached}
+
+        if missing:
+            print(f"🧮 Generating {len(missing)} embeddings in batches of {BATCH_SIZE}...")
+            try:
+                encoded = model.encode(
+                    list(missing.values()),
+                    batch_size=BATCH_SIZE,
+                    show_progress_bar=True,
+                    convert_to_numpy=True,
+                ).astype(np.float32)
+            except Exception as exc:
+                print(f"❌ Failed to generate embeddings: {exc}")
+                return
+            cached.update(zip(missing, encoded))
+            cache.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                ((key, cached[key].tobytes()) for key in missing),
+            )
+            print(f"   ✅ Generated {len(missing)} embeddings")
+
+    embeddings = np.stack([cached[key] for key in keys])
+
+    # Send pgvector text literals rather than lists of Python floats
+    updates = [
+        {"id": job["id"], "embedding": embedding}
+        for job, embedding in zip(jobs_to_process, to_vector_literals(embeddings))
+    ]
+
+    print(f"\n☁️ Saving embeddings to Supabase in chunks of {UPLOAD_CHUNK_SIZE}...")
     total_processed = 0
-
-    for i in range(0, len(jobs_to_process), BATCH_SIZE):
-        batch = jobs_to_process[i : i + BATCH_SIZE]
-        batch_num = (i // BATCH_SIZE) + 1
-        total_batches = (len(jobs_to_process) + BATCH_SIZE - 1) // BATCH_SIZE
-
-        # Build searchable text for each job
-        texts = [build_searchable_text(job) for job in batch]
-
-        # Generate embeddings
-        try:
-            embeddings = model.encode(texts, show_progress_bar=False, convert_to_numpy=True)
-            print(f"   ✅ Batch {batch_num}/{total_batches}: Generated {len(embeddings)} embeddings")
-
-            # Update Supabase with embeddings
-            updates = []
-            for job, embedding in zip(batch, embeddings):
-                updates.append({
-                    "id": job["id"],
-                    "embedding": embedding.tolist(),  # Convert numpy array to list
-                })
-
-            # Update in smaller chunks to avoid payload size limits
-            chunk_size = 10
-            for chunk_start in range(0, len(updates), chunk_size):
-                chunk = updates[chunk_start : chunk_start + chunk_size]
-                try:
-                    client.table("jobs").upsert(chunk).execute()
-                except Exception as exc:
-                    print(f"      ⚠️ Failed to update chunk: {exc}")
-                    continue
-
-            total_processed += len(batch)
-            print(f"      💾 Saved {len(updates)} embeddings to Supabase ({total_processed}/{len(jobs_to_process)})")
-
-        except Exception as exc:
-            print(f"   ❌ Batch {batch_num} failed: {exc}")
-            continue
+    with ThreadPoolExecutor(max_workers=UPLOAD_WORKERS) as executor:
+        uploads = [
+            executor.submit(upload_embeddings, client, updates[start : start + UPLOAD_CHUNK_SIZE])
+            for start in range(0, len(updates), UPLOAD_CHUNK_SIZE)
+        ]
+        for future in as_completed(uploads):
+            try:
+                total_processed += future.result()
+            except Exception as exc:
+                print(f"      ⚠️ Failed to update chunk: {exc}")
+
+    print(f"   💾 Saved {total_processed} embeddings to Supabase")
 
     print(f"\n🎉 Embedding generation complete!")
     print(f"   Processed: {total_processed}/{len(jobs_to_process)} jobs")
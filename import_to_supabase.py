@@ -3,11 +3,12 @@
 Standalone script to import processed_jobs_for_api.json into Supabase.
 Run this once to populate your Supabase database with all your job data.
 """
-import json
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import Any
 
+import orjson
 from dotenv import load_dotenv
 from supabase import create_client
 
@@ -28,6 +29,7 @@ SUPABASE_KEY = os.environ.get(
 )
 DATA_FILE = Path("processed_jobs_for_api.json")
 BATCH_SIZE = 500  # Supabase has limits on batch size
+UPLOAD_WORKERS = 8  # Batches in flight at once (I/O-bound, so threads overlap the round-trips)
 
 
 def chunked(items: list[dict[str, Any]], size: int = BATCH_SIZE):
@@ -36,6 +38,15 @@ def chunked(items: list[dict[str, Any]], size: int = BATCH_SIZE):
         yield items[index : index + size]
 
 
+def upsert_batch(client, batch: list[dict[str, Any]]) -> int:
+    """Upsert one batch of jobs and return how many rows were sent."""
+    client.table("jobs").upsert(
+        batch,
+        on_conflict="title,company,searched_city",
+    ).execute()
+    return len(batch)
+
+
 def main():
     """Import JSON data into Supabase."""
     if not DATA_FILE.exists():
@@ -45,9 +56,8 @@ def main():
 
     print(f"📂 Loading data from {DATA_FILE}...")
     try:
-        with DATA_FILE.open("r", encoding="utf-8") as file:
-            jobs = json.load(file)
-    except json.JSONDecodeError as exc:
+        jobs = orjson.loads(DATA_FILE.read_bytes())
+    except orjson.JSONDecodeError as exc:
         print(f"❌ Failed to parse {DATA_FILE}: {exc}")
         return
 
@@ -82,33 +92,37 @@ def main():
     # Import in batches
     print(f"☁️ Uploading {len(payload)} jobs to Supabase in batches of {BATCH_SIZE}...")
     total_imported = 0
-    for batch_num, batch in enumerate(chunked(payload, BATCH_SIZE), 1):
-        try:
-            result = client.table("jobs").upsert(
-                batch,
-                on_conflict="title,company,searched_city",
-            ).execute()
-            total_imported += len(batch)
-            print(f"   ✅ Batch {batch_num}: {len(batch)} jobs uploaded ({total_imported}/{len(payload)})")
-        except Exception as exc:
-            error_msg = str(exc)
-            print(f"   ❌ Batch {batch_num} failed: {error_msg}")
-            if "row-level security" in error_msg.lower() or "42501" in error_msg:
-                print("\n   ⚠️  RLS (Row Level Security) is blocking inserts!")
-                print("   📝 To fix this, run this SQL in Supabase SQL Editor:")
-                print("   ")
-                print("   -- Option 1: Disable RLS (simplest for public data)")
-                print("   ALTER TABLE public.jobs DISABLE ROW LEVEL SECURITY;")
-                print("   ")
-                print("   -- Option 2: Allow public inserts (more secure)")
-                print("   CREATE POLICY \"Allow public inserts\" ON public.jobs")
-                print("   FOR INSERT WITH CHECK (true);")
-                print("   ")
-                print("   -- Option 3: Use service_role key (bypasses RLS)")
-                print("   -- Add SUPABASE_SERVICE_ROLE_KEY to your .env file")
-                print("   -- Get it from: Supabase Dashboard > Settings > API > service_role key")
-                return
-            continue
+    with ThreadPoolExecutor(max_workers=UPLOAD_WORKERS) as executor:
+        futures = {
+            executor.submit(upsert_batch, client, batch): batch_num
+            for batch_num, batch in enumerate(chunked(payload, BATCH_SIZE), 1)
+        }
+        for future in as_completed(futures):
+            batch_num = futures[future]
+            try:
+                uploaded = future.result()
+                total_imported += uploaded
+                print(f"   ✅ Batch {batch_num}: {uploaded} jobs uploaded ({total_imported}/{len(payload)})")
+            except Exception as exc:
+                error_msg = str(exc)
+                print(f"   ❌ Batch {batch_num} failed: {error_msg}")
+                if "row-level security" in error_msg.lower() or "42501" in error_msg:
+                    print("\n   ⚠️  RLS (Row Level Security) is blocking inserts!")
+                    print("   📝 To fix this, run this SQL in Supabase SQL Editor:")
+                    print("   ")
+                    print("   -- Option 1: Disable RLS (simplest for public data)")
+                    print("   ALTER TABLE public.jobs DISABLE ROW LEVEL SECURITY;")
+                    print("   ")
+                    print("   -- Option 2: Allow public inserts (more secure)")
+                    print("   CREATE POLICY \"Allow public inserts\" ON public.jobs")
+                    print("   FOR INSERT WITH CHECK (true);")
+                    print("   ")
+                    print("   -- Option 3: Use service_role key (bypasses RLS)")
+                    print("   -- Add SUPABASE_SERVICE_ROLE_KEY to your .env file")
+                    print("   -- Get it from: Supabase Dashboard > Settings > API > service_role key")
+                    # Every other batch hits the same policy; don't start them
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    return
 
     if total_imported == 0:
         print(f"\n❌ Import failed! No jobs were imported.")
@@ -7,12 +7,14 @@ run it manually (`python scraper.py`) when you need a fresh dataset on demand.
 
 from __future__ import annotations
 
+import asyncio
 import csv
-import time
 from pathlib import Path
 from typing import List
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
 from jobspy import scrape_jobs
 
 OUTPUT_CSV = Path("morocco_data_market.csv")
@@ -28,61 +30,100 @@ ROLES: List[str] = [
     "Business Intelligence",
 ]
 SITES = ["indeed", "linkedin", "google", "bayt"]
+SCRAPE_CONCURRENCY = 4  # Searches in flight at once; each one already queries every site in SITES
+REQUEST_DELAY_SECONDS = 5  # Pause a worker keeps after each search, to stay under the sites' rate limits
+
+
+async def scrape_search(city: str, role: str, semaphore: asyncio.Semaphore) -> pd.DataFrame | None:
+    """Run one role/city search in a worker thread, holding a concurrency slot for its delay too."""
+    async with semaphore:
+        print(f"🔎 Scraping: {role} in {city}...")
+        try:
+            jobs = await asyncio.to_thread(
+                scrape_jobs,
+                site_name=SITES,
+                search_term=role,
+                google_search_term=f"{role} jobs in {city} Morocco",
+                location=f"{city}, Morocco" if city != "Morocco" else "Morocco",
+                results_wanted=40,
+                hours_old=720,
+                country_indeed="Morocco",
+                linkedin_fetch_description=True,
+                verbose=0,
+            )
+        except Exception as exc:  # pragma: no cover - network dependent
+            print(f"   ❌ Error ({role} in {city}): {exc}")
+            return None
+
+        if jobs.empty:
+            print(f"   ⚠️ No jobs found for {role} in {city}.")
+            jobs = None
+        else:
+            jobs["searched_city"] = city
+            jobs["searched_role"] = role
+            print(f"   ✅ Found {len(jobs)} jobs for {role} in {city}.")
+
+        await asyncio.sleep(REQUEST_DELAY_SECONDS)
+        return jobs
+
+
+def drop_seen_jobs(results: List[pd.DataFrame]) -> List[pd.DataFrame]:
+    """Keep the first posting of each (title, company) pair across the results, in order."""
+    unique_results: List[pd.DataFrame] = []
+    seen: pd.MultiIndex | None = None
+    for jobs in results:
+        # Vectorized hash lookups per search, so no combined frame of duplicates is ever built;
+        # Arrow-backed strings let pandas hash the keys with Arrow's kernels
+        keys = pd.MultiIndex.from_frame(jobs[["title", "company"]].astype("string[pyarrow]"))
+        is_new = ~keys.duplicated()
+        if seen is not None:
+            is_new &= ~keys.isin(seen)
+        unique_results.append(jobs[is_new])
+        seen = keys[is_new] if seen is None else seen.append(keys[is_new])
+    return unique_results
+
+
+def save_jobs(all_jobs: List[pd.DataFrame]) -> None:
+    """Merge the deduplicated search results and write OUTPUT_CSV."""
+    combined_jobs = pd.concat(drop_seen_jobs(all_jobs), ignore_index=True)
+    print(f"\n🎉 Total Unique Jobs: {len(combined_jobs)}")
 
+    try:
+        # Arrow's multithreaded C++ writer; it only quotes the cells that need it
+        table = pa.Table.from_pandas(combined_jobs, preserve_index=False)
+        pa_csv.write_csv(table, OUTPUT_CSV, write_options=pa_csv.WriteOptions(quoting_style="needed"))
+    except pa.ArrowException as exc:  # e.g. a column mixing types Arrow can't unify
+        print(f"   ⚠️ Arrow CSV writer failed ({exc}); falling back to pandas.")
+        combined_jobs.to_csv(
+            OUTPUT_CSV,
+            quoting=csv.QUOTE_NONNUMERIC,
+            escapechar="\\",
+            index=False,
+        )
+    print(f"💾 Data saved to '{OUTPUT_CSV}'")
+    print("\nColumns captured:")
+    print(combined_jobs.columns.tolist())
 
-def main() -> None:
-    all_jobs: List[pd.DataFrame] = []
 
+async def main() -> None:
     print(f"🚀 Starting High-Volume Scraper for: {', '.join(CITIES)}")
     print(f"🎯 Looking for roles: {', '.join(ROLES)}\n")
 
-    for city in CITIES:
-        for role in ROLES:
-            print(f"🔎 Scraping: {role} in {city}...")
-            try:
-                jobs = scrape_jobs(
-                    site_name=SITES,
-                    search_term=role,
-                    google_search_term=f"{role} jobs in {city} Morocco",
-                    location=f"{city}, Morocco" if city != "Morocco" else "Morocco",
-                    results_wanted=40,
-                    hours_old=720,
-                    country_indeed="Morocco",
-                    linkedin_fetch_description=True,
-                    verbose=0,
-                )
-
-                if not jobs.empty:
-                    jobs["searched_city"] = city
-                    jobs["searched_role"] = role
-                    all_jobs.append(jobs)
-                    print(f"   ✅ Found {len(jobs)} jobs.")
-                else:
-                    print("   ⚠️ No jobs found.")
-
-                time.sleep(5)
-            except Exception as exc:  # pragma: no cover - network dependent
-                print(f"   ❌ Error: {exc}")
+    # Searches are network-bound, so a few run at once; gather keeps the city/role order,
+    # which decides which duplicate survives below
+    semaphore = asyncio.Semaphore(SCRAPE_CONCURRENCY)
+    results = await asyncio.gather(
+        *(scrape_search(city, role, semaphore) for city in CITIES for role in ROLES)
+    )
+    all_jobs = [jobs for jobs in results if jobs is not None]
 
     if not all_jobs:
         print("\n😔 No jobs found. Check your internet connection or proxies.")
         return
 
-    combined_jobs = pd.concat(all_jobs, ignore_index=True)
-    combined_jobs.drop_duplicates(subset=["title", "company"], keep="first", inplace=True)
-    print(f"\n🎉 Total Unique Jobs: {len(combined_jobs)}")
-
-    combined_jobs.to_csv(
-        OUTPUT_CSV,
-        quoting=csv.QUOTE_NONNUMERIC,
-        escapechar="\\",
-        index=False,
-    )
-    print(f"💾 Data saved to '{OUTPUT_CSV}'")
-    print("\nColumns captured:")
-    print(combined_jobs.columns.tolist())
+    await asyncio.to_thread(save_jobs, all_jobs)
 
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
 
@@ -61,6 +61,9 @@ GRANT EXECUTE ON FUNCTION public.search_jobs_hybrid(vector, float, int, text, te
 
 
 -- 2. Create "More Like This" function (find similar jobs based on a job's embedding)
+--    source_status tells the API why a result is empty without a second query:
+--    'ok' rows are matches; a single 'not_found' or 'no_embedding' row (other columns NULL)
+--    means the source job is missing or has not been embedded yet.
 DROP FUNCTION IF EXISTS public.find_similar_jobs(bigint, float, int) CASCADE;
 
 CREATE FUNCTION public.find_similar_jobs(
@@ -78,7 +81,8 @@ RETURNS TABLE (
   job_url text,
   date_posted text,
   extracted_skills jsonb,
-  similarity float
+  similarity float,
+  source_status text
 )
 LANGUAGE plpgsql
 SECURITY DEFINER
@@ -87,12 +91,19 @@ DECLARE
   source_embedding vector(384);
 BEGIN
   -- Get the embedding of the source job
-  SELECT embedding INTO source_embedding
-  FROM public.jobs
-  WHERE id = source_job_id AND embedding IS NOT NULL;
-  
-  -- If source job doesn't have embedding, return empty
+  SELECT src.embedding INTO source_embedding
+  FROM public.jobs src
+  WHERE src.id = source_job_id;
+
+  IF NOT FOUND THEN
+    RETURN QUERY SELECT NULL::bigint, NULL::text, NULL::text, NULL::text, NULL::text, NULL::text,
+      NULL::text, NULL::text, NULL::jsonb, NULL::float, 'not_found'::text;
+    RETURN;
+  END IF;
+
   IF source_embedding IS NULL THEN
+    RETURN QUERY SELECT NULL::bigint, NULL::text, NULL::text, NULL::text, NULL::text, NULL::text,
+      NULL::text, NULL::text, NULL::jsonb, NULL::float, 'no_embedding'::text;
     RETURN;
   END IF;
   
@@ -108,7 +119,8 @@ BEGIN
     j.job_url,
     COALESCE(CAST(j.date_posted AS text), '') as date_posted,
     j.extracted_skills,
-    1 - (j.embedding <=> source_embedding) as similarity
+    1 - (j.embedding <=> source_embedding) as similarity,
+    'ok'::text as source_status
   FROM public.jobs j
   WHERE j.embedding IS NOT NULL
     AND j.id != source_job_id  -- Exclude the source job
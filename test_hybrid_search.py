@@ -1,22 +1,22 @@
 #!/usr/bin/env python3
 """Test script for Hybrid Search and More Like This features."""
 
-import requests
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Optional
 
+import requests
+
 API_URL = "http://127.0.0.1:8000"
 
 
-def test_hybrid_search(query: str, city: Optional[str] = None, skill: Optional[str] = None):
-    """Test hybrid search: semantic search + filters."""
-    print(f"\n{'='*60}")
-    print(f"🔍 Hybrid Search: '{query}'")
-    if city:
-        print(f"   📍 City: {city}")
-    if skill:
-        print(f"   🔧 Skill: {skill}")
-    print(f"{'='*60}")
-    
+def fetch(path: str, params: dict) -> requests.Response:
+    """GET an API path, raising for HTTP errors."""
+    response = requests.get(f"{API_URL}{path}", params=params)
+    response.raise_for_status()
+    return response
+
+
+def hybrid_search_params(query: str, city: Optional[str] = None, skill: Optional[str] = None) -> dict:
     params = {
         "query": query,
         "limit": 5,
@@ -26,11 +26,21 @@ def test_hybrid_search(query: str, city: Optional[str] = None, skill: Optional[s
         params["city"] = city
     if skill:
         params["skill"] = skill
+    return params
+
+
+def test_hybrid_search(query: str, city: Optional[str], skill: Optional[str], pending: Future):
+    """Test hybrid search: semantic search + filters (pending is the in-flight request)."""
+    print(f"\n{'='*60}")
+    print(f"🔍 Hybrid Search: '{query}'")
+    if city:
+        print(f"   📍 City: {city}")
+    if skill:
+        print(f"   🔧 Skill: {skill}")
+    print(f"{'='*60}")
     
     try:
-        response = requests.get(f"{API_URL}/jobs/search/hybrid", params=params)
-        response.raise_for_status()
-        data = response.json()
+        data = pending.result().json()
         
         print(f"\n✅ Found {data['total']} jobs")
         print(f"   Query: {data['query']}")
@@ -50,17 +60,15 @@ def test_hybrid_search(query: str, city: Optional[str] = None, skill: Optional[s
             print(f"   Details: {e.response.text}")
 
 
-def test_similar_jobs(job_id: int):
-    """Test 'More Like This' feature."""
+def test_similar_jobs(job_id: int, jobs_page: Future):
+    """Test 'More Like This' feature (jobs_page is the in-flight /jobs?limit=1000 request)."""
     print(f"\n{'='*60}")
     print(f"🔗 Finding jobs similar to Job #{job_id}")
     print(f"{'='*60}")
     
     try:
         # First, get the source job details
-        response = requests.get(f"{API_URL}/jobs", params={"limit": 1000})
-        response.raise_for_status()
-        jobs_data = response.json()
+        jobs_data = jobs_page.result().json()
         
         source_job = None
         for job in jobs_data['data']:
@@ -76,9 +84,7 @@ def test_similar_jobs(job_id: int):
             print(f"   🔧 Skills: {skills}")
         
         # Now find similar jobs
-        response = requests.get(f"{API_URL}/jobs/{job_id}/similar", params={"limit": 5, "threshold": 0.2})
-        response.raise_for_status()
-        data = response.json()
+        data = fetch(f"/jobs/{job_id}/similar", {"limit": 5, "threshold": 0.2}).json()
         
         print(f"\n✅ Found {data['total']} similar jobs")
         
@@ -96,12 +102,10 @@ def test_similar_jobs(job_id: int):
             print(f"   Details: {e.response.text}")
 
 
-def get_sample_job_id():
+def get_sample_job_id(jobs_page: Future):
     """Get a sample job ID that has an embedding."""
     try:
-        response = requests.get(f"{API_URL}/jobs", params={"limit": 10})
-        response.raise_for_status()
-        data = response.json()
+        data = jobs_page.result().json()
         
         if data['data']:
             return data['data'][0].get('id')
@@ -114,21 +118,29 @@ if __name__ == "__main__":
     print("🚀 Testing Hybrid Search & More Like This Features")
     print("="*60)
     
-    # Test 1: Hybrid search with city filter
-    test_hybrid_search("Machine Learning", city="Casablanca")
-    
-    # Test 2: Hybrid search with skill filter
-    test_hybrid_search("Data Science", skill="Python")
-    
-    # Test 3: Hybrid search with both filters
-    test_hybrid_search("Backend Development", city="Rabat", skill="Java")
-    
-    # Test 4: More Like This feature
-    job_id = get_sample_job_id()
-    if job_id:
-        test_similar_jobs(job_id)
-    else:
-        print("\n⚠️ Could not test 'More Like This' - no jobs found")
+    searches = [
+        ("Machine Learning", "Casablanca", None),  # Test 1: Hybrid search with city filter
+        ("Data Science", None, "Python"),  # Test 2: Hybrid search with skill filter
+        ("Backend Development", "Rabat", "Java"),  # Test 3: Hybrid search with both filters
+    ]
+    # The probes are independent and network-bound, so they are all sent at once;
+    # results are still printed in order
+    with ThreadPoolExecutor(max_workers=len(searches) + 1) as executor:
+        pending = [
+            executor.submit(fetch, "/jobs/search/hybrid", hybrid_search_params(query, city, skill))
+            for query, city, skill in searches
+        ]
+        jobs_page = executor.submit(fetch, "/jobs", {"limit": 1000})
+        
+        for (query, city, skill), response in zip(searches, pending):
+            test_hybrid_search(query, city, skill, response)
+        
+        # Test 4: More Like This feature
+        job_id = get_sample_job_id(jobs_page)
+        if job_id:
+            test_similar_jobs(job_id, jobs_page)
+        else:
+            print("\n⚠️ Could not test 'More Like This' - no jobs found")
     
     print("\n" + "="*60)
     print("✅ All tests completed!")
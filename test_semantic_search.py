@@ -3,6 +3,7 @@
 Test script to verify semantic search is working correctly.
 """
 import os
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 from supabase import create_client
 from sentence_transformers import SentenceTransformer
@@ -74,31 +75,39 @@ def main():
         "SQL"
     ]
     
+    # Encode every query in one batched forward pass
+    try:
+        query_embeddings = model.encode(test_queries, convert_to_numpy=True, batch_size=16).tolist()
+    except Exception as exc:
+        print(f"   ❌ Failed to encode test queries: {exc}\n")
+        return
+    
+    def search(query_embedding: list[float]) -> list[dict]:
+        response = client.rpc(
+            "search_jobs_semantic",
+            {
+                "query_embedding": query_embedding,
+                "match_threshold": 0.1,  # Very low threshold for testing
+                "match_count": 5,
+            },
+        ).execute()
+        return response.data or []
+    
     print("5. Testing semantic search with different queries:\n")
-    for query in test_queries:
-        try:
-            # Generate embedding
-            query_embedding = model.encode(query, convert_to_numpy=True).tolist()
-            
-            # Call RPC
-            response = client.rpc(
-                "search_jobs_semantic",
-                {
-                    "query_embedding": query_embedding,
-                    "match_threshold": 0.1,  # Very low threshold for testing
-                    "match_count": 5,
-                },
-            ).execute()
-            
-            results = response.data or []
-            print(f"   Query: '{query}' → Found {len(results)} results")
-            if results:
-                print(f"      Top match: {results[0].get('title', 'N/A')} (similarity: {results[0].get('similarity', 'N/A'):.3f})")
-            else:
-                print(f"      ⚠️ No results (try lowering threshold or check embeddings)")
-        except Exception as exc:
-            print(f"   ❌ Query '{query}' failed: {exc}")
-        print()
+    # The RPCs are network-bound, so they all run at once; results are reported in query order
+    with ThreadPoolExecutor(max_workers=len(test_queries)) as executor:
+        futures = [executor.submit(search, query_embedding) for query_embedding in query_embeddings]
+        for query, future in zip(test_queries, futures):
+            try:
+                results = future.result()
+                print(f"   Query: '{query}' → Found {len(results)} results")
+                if results:
+                    print(f"      Top match: {results[0].get('title', 'N/A')} (similarity: {results[0].get('similarity', 'N/A'):.3f})")
+                else:
+                    print(f"      ⚠️ No results (try lowering threshold or check embeddings)")
+            except Exception as exc:
+                print(f"   ❌ Query '{query}' failed: {exc}")
+            print()
     
     print("✅ Test complete!")
 
@@ -1,22 +1,26 @@
 #!/usr/bin/env python3
 """Test script to verify Supabase sync works after fixing RLS."""
 
-from main import sync_supabase_from_disk, load_data, JOBS_DATA
+import asyncio
+
+import main
+from main import sync_supabase_from_disk, load_data
 
 print("🔄 Testing Supabase sync after RLS fix...")
 print("=" * 50)
 
 try:
     # Try to sync
-    sync_supabase_from_disk()
+    asyncio.run(sync_supabase_from_disk())
     print("\n✅ Sync completed successfully!")
     
     # Reload data from Supabase
     load_data()
-    print(f"📊 Total jobs in API: {len(JOBS_DATA)}")
+    jobs = main.DATA.jobs
+    print(f"📊 Total jobs in API: {len(jobs)}")
     
-    if JOBS_DATA:
-        print(f"📝 Sample job: {JOBS_DATA[0].get('title', 'N/A')} @ {JOBS_DATA[0].get('company', 'N/A')}")
+    if jobs:
+        print(f"📝 Sample job: {jobs[0].get('title', 'N/A')} @ {jobs[0].get('company', 'N/A')}")
         print("\n✅ All systems working! Your data is synced to Supabase.")
     else:
         print("⚠️  No jobs found in database. Make sure data was synced.")